@@ -0,0 +1,218 @@
+import logging
+import queue
+import sqlite3
+import threading
+import time
+from collections import defaultdict, deque
+
+logger = logging.getLogger(__name__)
+
+
+class EmailAlertDispatcher:
+    # Render code only enqueues. A background worker keeps one logged-in SMTP
+    # connection per sender alive, drains the queue in batches and reconnects
+    # when the server drops the session.
+    def __init__(self, host="smtp.gmail.com", port=465, use_ssl=True, batch_size=20,
+                 idle_timeout=240, timeout=30):
+        self.host = host
+        self.port = port
+        self.use_ssl = use_ssl
+        self.batch_size = batch_size
+        self.idle_timeout = idle_timeout
+        self.timeout = timeout
+        self._queue = queue.Queue()
+        self._connections = {}
+        self._errors = defaultdict(lambda: deque(maxlen=20))
+        self._errors_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._thread_lock = threading.Lock()
+
+    def send(self, subject, body, to_email, from_email, password, on_failure=None):
+        # on_failure(error) runs on the worker thread if delivery fails
+        from email.mime.text import MIMEText
+        msg = MIMEText(body)
+        msg["Subject"] = subject
+        msg["From"] = from_email
+        msg["To"] = to_email
+        self._queue.put((from_email, password, to_email, msg.as_string(), on_failure))
+        self._ensure_worker()
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def drain_errors(self, from_email):
+        with self._errors_lock:
+            errors = list(self._errors.pop(from_email, ()))
+        return errors
+
+    def flush(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.01)
+        return True
+
+    def stop(self):
+        self._stopped.set()
+        self._queue.put(None)
+
+    def _ensure_worker(self):
+        with self._thread_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="email-alerts", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                first = self._queue.get(timeout=self.idle_timeout / 4)
+            except queue.Empty:
+                self._close_idle()
+                continue
+            batch = [first]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._deliver([item for item in batch if item is not None])
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            self._close_idle()
+        for credentials in list(self._connections):
+            self._disconnect(credentials)
+
+    def _deliver(self, batch):
+        by_sender = defaultdict(list)
+        for from_email, password, to_email, message, on_failure in batch:
+            by_sender[(from_email, password)].append((to_email, message, on_failure))
+        for credentials, messages in by_sender.items():
+            for to_email, message, on_failure in messages:
+                try:
+                    self._sendmail(credentials, to_email, message)
+                except Exception as e:
+                    logger.warning("Email alert to %s failed: %s", to_email, e)
+                    with self._errors_lock:
+                        self._errors[credentials[0]].append(str(e))
+                    if on_failure is not None:
+                        try:
+                            on_failure(e)
+                        except Exception:
+                            logger.exception("Email failure callback raised")
+
+    def _sendmail(self, credentials, to_email, message):
+        import smtplib
+        for attempt in range(2):
+            server = self._connect(credentials)
+            try:
+                server.sendmail(credentials[0], to_email, message)
+                self._connections[credentials] = (server, time.monotonic())
+                return
+            except (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError):
+                # stale keep-alive connection; reconnect once before giving up
+                self._disconnect(credentials)
+                if attempt:
+                    raise
+
+    def _connect(self, credentials):
+        import smtplib
+        entry = self._connections.get(credentials)
+        if entry is not None:
+            return entry[0]
+        smtp_class = smtplib.SMTP_SSL if self.use_ssl else smtplib.SMTP
+        server = smtp_class(self.host, self.port, timeout=self.timeout)
+        from_email, password = credentials
+        if password:
+            try:
+                server.login(from_email, password)
+            except Exception:
+                server.close()
+                raise
+        self._connections[credentials] = (server, time.monotonic())
+        return server
+
+    def _disconnect(self, credentials):
+        entry = self._connections.pop(credentials, None)
+        if entry is None:
+            return
+        try:
+            entry[0].quit()
+        except Exception:
+            entry[0].close()
+
+    def _close_idle(self):
+        now = time.monotonic()
+        for credentials, (_, last_used) in list(self._connections.items()):
+            if now - last_used > self.idle_timeout:
+                self._disconnect(credentials)
+
+
+class AlertStore:
+    # Remembers every (ticker, interval, bar, signal, recipient) that already
+    # fired, so a crossover sitting in the last bars alerts each recipient once
+    # instead of on every rerun.
+    def __init__(self, path):
+        self.path = str(path)
+        with self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            columns = [row[1] for row in conn.execute("PRAGMA table_info(fired_alerts)")]
+            if columns and "recipient" not in columns:
+                # rows from before recipients were tracked can't dedupe anyone's alerts
+                conn.execute("DROP TABLE fired_alerts")
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS fired_alerts (
+                    ticker TEXT NOT NULL,
+                    interval TEXT NOT NULL,
+                    bar_time TEXT NOT NULL,
+                    signal TEXT NOT NULL,
+                    recipient TEXT NOT NULL,
+                    price TEXT,
+                    fired_at REAL NOT NULL,
+                    PRIMARY KEY (ticker, interval, bar_time, signal, recipient)
+                )
+                """
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    def record(self, ticker, interval, bar_time, signal, recipient, price=None):
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "INSERT OR IGNORE INTO fired_alerts VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (ticker, interval, str(bar_time), signal, recipient, price, time.time()),
+            )
+        return cursor.rowcount == 1
+
+    def forget(self, ticker, interval, bar_time, signal, recipient):
+        # undo a record whose delivery failed, so the next scan retries it
+        with self._connect() as conn:
+            conn.execute(
+                "DELETE FROM fired_alerts WHERE ticker = ? AND interval = ? AND bar_time = ?"
+                " AND signal = ? AND recipient = ?",
+                (ticker, interval, str(bar_time), signal, recipient),
+            )
+
+    def history(self, ticker=None, recipient=None, limit=100):
+        query = "SELECT ticker, interval, bar_time, signal, recipient, price, fired_at FROM fired_alerts"
+        conditions = []
+        params = []
+        if ticker is not None:
+            conditions.append("ticker = ?")
+            params.append(ticker)
+        if recipient is not None:
+            conditions.append("recipient = ?")
+            params.append(recipient)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY fired_at DESC LIMIT ?"
+        params.append(limit)
+        with self._connect() as conn:
+            rows = conn.execute(query, params).fetchall()
+        columns = ("ticker", "interval", "bar_time", "signal", "recipient", "price", "fired_at")
+        return [dict(zip(columns, row)) for row in rows]
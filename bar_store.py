@@ -0,0 +1,362 @@
+import os
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from pathlib import Path
+
+import pandas as pd
+
+from singleflight import SingleFlight
+
+
+# Everything that changes what a provider returns is part of the key, so two
+# requests only ever share a cache entry when they would get the same bars.
+BarKey = namedtuple("BarKey", "ticker interval period prepost auto_adjust", defaults=(False, True))
+
+# how long a cached frame is served without asking upstream for new bars
+DEFAULT_TTL = {"1m": 30, "2m": 60, "5m": 60, "15m": 120, "30m": 300, "1h": 300}
+
+
+def bar_series(key):
+    # bars on disk don't depend on the period, only on what each bar contains
+    name = key.interval
+    if key.prepost:
+        name += "-prepost"
+    if not key.auto_adjust:
+        name += "-raw"
+    return name
+
+
+def merge_bars(cached, tail):
+    if tail is None or tail.empty:
+        return cached
+    if cached is None or cached.empty:
+        return tail
+    # the last cached bar is usually still forming, so the refetched copy wins
+    combined = pd.concat([cached, tail])
+    combined = combined[~combined.index.duplicated(keep="last")]
+    return combined.sort_index()
+
+
+def split_batch(batch, ticker):
+    # keep the (Price, Ticker) column layout providers give a single symbol
+    if batch is None or batch.empty or ticker not in batch.columns.get_level_values("Ticker"):
+        return pd.DataFrame()
+    frame = batch.xs(ticker, axis=1, level="Ticker", drop_level=False)
+    return frame.dropna(how="all")
+
+
+def chunked(items, size):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def period_days(period):
+    if period.endswith("d"):
+        return int(period[:-1])
+    if period.endswith("mo"):
+        return int(period[:-2]) * 31
+    if period.endswith("y"):
+        return int(period[:-1]) * 366
+    raise ValueError(f"Unsupported period: {period}")
+
+
+def trim_to_period(data, period):
+    if data.empty:
+        return data
+    sessions = data.index.normalize()
+    days = sessions.unique()
+    keep = period_days(period)
+    if len(days) <= keep:
+        return data
+    return data[sessions >= days[-keep]]
+
+
+def covers_period(data, period):
+    # whether data reaches back as far as a fresh download for period would; day
+    # files are shared across periods, so a shorter period may have written them
+    days = data.index.normalize().unique()
+    if len(days) >= period_days(period):
+        return True
+    today = pd.Timestamp.now(tz=days.tz).normalize()
+    if period.endswith("d"):
+        start = today - pd.offsets.BDay(int(period[:-1]) - 1)
+    else:
+        months = int(period[:-2]) if period.endswith("mo") else 12 * int(period[:-1])
+        # the first session can fall a long weekend after the calendar start
+        start = today - pd.DateOffset(months=months) + pd.Timedelta(days=4)
+    return days[0] <= start
+
+
+class DiskBarCache:
+    def __init__(self, root, retention_days=7):
+        self.root = Path(root)
+        self.retention_days = retention_days
+        self._pruned_on = None
+
+    def _dir(self, key):
+        return self.root / key.ticker / bar_series(key)
+
+    def load(self, key):
+        files = sorted(self._dir(key).glob("*.parquet"))
+        frames = []
+        for path in files:
+            try:
+                frames.append(pd.read_parquet(path))
+            except Exception:
+                # a half-written or corrupt day file is simply refetched
+                path.unlink(missing_ok=True)
+        if not frames:
+            return None
+        data = trim_to_period(pd.concat(frames).sort_index(), key.period)
+        return data if covers_period(data, key.period) else None
+
+    def save(self, key, data, since=None):
+        if data is None or data.empty:
+            return
+        # long-running processes would otherwise only prune once, at startup
+        if self._pruned_on != pd.Timestamp.now().normalize():
+            self.prune()
+        directory = self._dir(key)
+        directory.mkdir(parents=True, exist_ok=True)
+        sessions = data.index.normalize()
+        for day in sessions.unique():
+            if since is not None and day < since.normalize():
+                continue
+            path = directory / f"{day:%Y-%m-%d}.parquet"
+            tmp = path.with_suffix(".tmp")
+            data[sessions == day].to_parquet(tmp)
+            os.replace(tmp, path)
+
+    def prune(self):
+        if self.retention_days is None or not self.root.exists():
+            return
+        today = pd.Timestamp.now().normalize()
+        self._pruned_on = today
+        cutoff = today - pd.Timedelta(days=self.retention_days)
+        for path in self.root.glob("*/*/*.parquet"):
+            try:
+                day = pd.Timestamp(path.stem)
+            except ValueError:
+                continue
+            if day < cutoff:
+                path.unlink(missing_ok=True)
+
+
+class ArrowBarCache:
+    # One Arrow IPC file per (ticker, interval). Readers memory-map it, so every
+    # session and worker process on the box shares the same OHLCV buffers. The
+    # frames mapped by this process are an LRU bounded by count and bytes.
+    def __init__(self, root, max_mapped=512, max_bytes=256 * 1024 * 1024):
+        self.root = Path(root)
+        self.max_mapped = max_mapped
+        self.max_bytes = max_bytes
+        self._mapped = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def _path(self, key):
+        return self.root / key.ticker / f"{bar_series(key)}-{key.period}.arrow"
+
+    def write(self, key, data):
+        import pyarrow as pa
+        path = self._path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        table = pa.Table.from_pandas(data)
+        tmp = path.with_suffix(f".{os.getpid()}.tmp")
+        with pa.OSFile(str(tmp), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        # readers keep their mapping of the old inode until they notice the new mtime
+        os.replace(tmp, path)
+
+    def read(self, key):
+        import pyarrow as pa
+        path = self._path(key)
+        try:
+            stat = path.stat()
+        except FileNotFoundError:
+            return None, 0.0
+        with self._lock:
+            entry = self._mapped.get(path)
+            if entry is not None and entry[0] == stat.st_mtime_ns:
+                self._mapped.move_to_end(path)
+                return entry[1], stat.st_mtime
+        try:
+            source = pa.memory_map(str(path))
+            table = pa.ipc.open_file(source).read_all()
+        except (OSError, pa.ArrowInvalid):
+            return None, 0.0
+        # split_blocks keeps numeric columns as zero-copy, read-only views of the map
+        frame = table.to_pandas(split_blocks=True)
+        size = table.nbytes
+        with self._lock:
+            previous = self._mapped.pop(path, None)
+            if previous is not None:
+                self._bytes -= previous[2]
+            self._mapped[path] = (stat.st_mtime_ns, frame, size)
+            self._bytes += size
+            while self._mapped and (len(self._mapped) > self.max_mapped or self._bytes > self.max_bytes):
+                _, (_, _, evicted) = self._mapped.popitem(last=False)
+                self._bytes -= evicted
+        return frame, stat.st_mtime
+
+
+class BarStore:
+    def __init__(self, provider, disk=None, shared=None, ttl=None, max_entries=512, max_bytes=256 * 1024 * 1024):
+        self._frames = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._flights = SingleFlight()
+        self.provider = provider
+        self.disk = disk
+        self.shared = shared
+        self.ttl = dict(DEFAULT_TTL, **(ttl or {}))
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        if disk is not None:
+            disk.prune()
+
+    def ttl_for(self, interval):
+        return self.ttl.get(interval, 60)
+
+    def get(self, ticker, interval, period, max_age=None, prepost=False, auto_adjust=True):
+        key = BarKey(ticker, interval, period, prepost, auto_adjust)
+        max_age = self.ttl_for(interval) if max_age is None else max_age
+        cached, fetched_at = self._cached(key)
+        if cached is not None and time.time() - fetched_at < max_age:
+            return cached
+        # sessions missing on the same key at once share a single download
+        return self._flights.do(key, lambda: self._refresh(key, cached))
+
+    def get_many(self, tickers, interval, period, max_age=None, chunk_size=50, prepost=False, auto_adjust=True):
+        tickers = list(dict.fromkeys(tickers))
+        max_age = self.ttl_for(interval) if max_age is None else max_age
+        keys = {ticker: BarKey(ticker, interval, period, prepost, auto_adjust) for ticker in tickers}
+        result = {}
+        full = []
+        tails = {}
+        for ticker, key in keys.items():
+            cached, fetched_at = self._cached(key)
+            if cached is not None and time.time() - fetched_at < max_age:
+                result[ticker] = cached
+            elif cached is None or cached.empty or self._is_stale(cached, period):
+                full.append(ticker)
+            else:
+                tails[ticker] = cached
+
+        # symbols another caller is already fetching are waited on, not refetched
+        claimed = {}
+        waiting = {}
+        for ticker in full + list(tails):
+            call, leader = self._flights.claim(keys[ticker])
+            (claimed if leader else waiting)[ticker] = call
+        full = [ticker for ticker in full if ticker in claimed]
+        tails = {ticker: cached for ticker, cached in tails.items() if ticker in claimed}
+
+        def settle(ticker, data):
+            result[ticker] = data
+            self._flights.resolve(keys[ticker], claimed.pop(ticker), result=data)
+
+        request = keys[tickers[0]] if tickers else None
+        try:
+            for chunk in chunked(full, chunk_size):
+                batch = self.provider.bars(chunk, **self._request(request, period=period))
+                for ticker in chunk:
+                    settle(ticker, self._store(keys[ticker], split_batch(batch, ticker), None))
+
+            for chunk in chunked(list(tails), chunk_size):
+                # one request from the oldest tail covers every symbol in the chunk
+                start = min(tails[ticker].index[-1] for ticker in chunk)
+                try:
+                    batch = self.provider.bars(chunk, **self._request(request, start=start))
+                except Exception:
+                    batch = None
+                for ticker in chunk:
+                    cached = tails[ticker]
+                    data = trim_to_period(merge_bars(cached, split_batch(batch, ticker)), period)
+                    settle(ticker, self._store(keys[ticker], data, cached.index[-1]))
+        except BaseException as e:
+            for ticker, call in list(claimed.items()):
+                self._flights.resolve(keys[ticker], call, error=e)
+            raise
+
+        for ticker, call in waiting.items():
+            try:
+                result[ticker] = call.wait()
+            except Exception:
+                result[ticker] = pd.DataFrame()
+        return {ticker: result[ticker] for ticker in tickers}
+
+    def last_timestamp(self, ticker, interval, period, prepost=False, auto_adjust=True):
+        cached, _ = self._cached(BarKey(ticker, interval, period, prepost, auto_adjust))
+        if cached is None or cached.empty:
+            return None
+        return cached.index[-1]
+
+    def _refresh(self, key, cached):
+        ticker, period = key.ticker, key.period
+        since = None
+        if cached is None or cached.empty or self._is_stale(cached, period):
+            data = self.provider.bars(ticker, **self._request(key, period=period))
+        else:
+            since = cached.index[-1]
+            try:
+                tail = self.provider.bars(ticker, **self._request(key, start=since))
+            except Exception:
+                tail = None
+            data = trim_to_period(merge_bars(cached, tail), period)
+
+        return self._store(key, data, since)
+
+    def _request(self, key, **kwargs):
+        return dict(interval=key.interval, prepost=key.prepost, auto_adjust=key.auto_adjust, **kwargs)
+
+    def _store(self, key, data, since):
+        if data is None or data.empty:
+            return data
+        if self.disk is not None:
+            self.disk.save(key, data, since=since)
+        if self.shared is not None:
+            self.shared.write(key, data)
+            data, _ = self.shared.read(key)
+        else:
+            self._remember(key, data)
+        return data
+
+    def _remember(self, key, data):
+        size = int(data.memory_usage(index=True).sum())
+        with self._lock:
+            previous = self._frames.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[2]
+            self._frames[key] = (data, time.time(), size)
+            self._bytes += size
+            while self._frames and (len(self._frames) > self.max_entries or self._bytes > self.max_bytes):
+                _, (_, _, evicted) = self._frames.popitem(last=False)
+                self._bytes -= evicted
+
+    def _cached(self, key):
+        if self.shared is not None:
+            frame, fetched_at = self.shared.read(key)
+            if frame is not None:
+                return frame, fetched_at
+        else:
+            with self._lock:
+                entry = self._frames.get(key)
+                if entry is not None:
+                    self._frames.move_to_end(key)
+                    return entry[0], entry[1]
+        if self.disk is not None:
+            return self.disk.load(key), 0.0
+        return None, 0.0
+
+    def clear(self):
+        with self._lock:
+            self._frames.clear()
+            self._bytes = 0
+
+    def _is_stale(self, cached, period):
+        last = cached.index[-1]
+        now = pd.Timestamp.now(tz=last.tz)
+        return now - last > pd.Timedelta(days=period_days(period))
@@ -0,0 +1,139 @@
+"""Correctness checks for the fast paths the benchmarks time.
+
+    python benchmarks/checks.py
+    python benchmarks/checks.py --checks scan_watchlist
+
+Each check runs a fast path next to the straightforward computation it
+replaces, on seeded synthetic data, and prints how many results disagree.
+The exit status is 1 when any check fails.
+"""
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from charts import MacdChart  # noqa: E402
+from indicators import BUY_SIGNAL, SELL_SIGNAL, find_crossovers, scan_watchlist  # noqa: E402
+from macd_core import check_cross, get_macd, get_vwap  # noqa: E402
+from rate_limit import RateLimiter  # noqa: E402
+
+
+def check_scan_watchlist(seeds=30, tickers=20, bars=200):
+    # ragged watchlists: late starts, early stops, interior gaps and a one-bar symbol,
+    # each compared with get_macd/check_cross on that symbol alone
+    index = pd.date_range("2026-10-15 09:30", periods=bars, freq="1min", tz="America/New_York")
+    failures = 0
+    for seed in range(seeds):
+        rng = np.random.default_rng(seed)
+        frames = {}
+        for i in range(tickers):
+            times = index[int(rng.integers(0, 30)):bars - (int(rng.integers(1, 6)) if i % 2 else 0)]
+            if i % 5 == 0:
+                times = times.delete(rng.choice(len(times) - 5, 5, replace=False))
+            close = 100 + np.cumsum(rng.standard_normal(len(times)) * 0.3)
+            frames[f"S{i}"] = pd.DataFrame({("Close", f"S{i}"): close}, index=times)
+        frames["ONE"] = pd.DataFrame({("Close", "ONE"): [1.0]}, index=index[5:6])
+
+        scan = scan_watchlist(frames).set_index("Ticker")
+        for ticker, frame in frames.items():
+            macd, signal = get_macd(frame)
+            row = scan.loc[ticker]
+            if (row["Alert"] != check_cross(macd, signal)
+                    or not np.isclose(row["MACD"], macd.iloc[-1])
+                    or not np.isclose(row["Signal"], signal.iloc[-1])
+                    or row["Last Bar"] != frame.index[-1]
+                    or row["Price"] != frame.iloc[-1, 0]):
+                failures += 1
+    return failures, seeds * (tickers + 1)
+
+
+def check_chart_markers(bars=5000, max_points=800, seed=0):
+    # crossovers mostly fall on bars LTTB drops; every marker must still sit on the MACD line
+    rng = np.random.default_rng(seed)
+    index = pd.date_range("2026-10-15 09:30", periods=bars, freq="1min", tz="America/New_York")
+    close = 100 + np.cumsum(rng.standard_normal(bars) * 0.3)
+    data = pd.DataFrame({"High": close + 0.1, "Low": close - 0.1, "Close": close,
+                         "Volume": rng.integers(100, 10_000, bars).astype(float)}, index=index)
+    macd, signal = get_macd(data)
+    crossovers = find_crossovers(macd, signal)
+    buys = crossovers.index[crossovers == BUY_SIGNAL]
+    sells = crossovers.index[crossovers == SELL_SIGNAL]
+    chart = MacdChart()
+    chart.update(data.index, macd, signal, get_vwap(data), buys, sells, max_points=max_points)
+    failures = 0
+    for name, times in (("buy", buys), ("sell", sells)):
+        y = np.asarray(chart._lines[name].get_ydata(), dtype=float)
+        failures += int(np.sum(~np.isfinite(y) | ~np.isclose(y, macd.reindex(times).to_numpy())))
+    chart.close()
+    return failures, len(buys) + len(sells)
+
+
+def check_throttle_attribution(rounds=20):
+    # one download logs a throttle the way yf.download does while another runs
+    # next to it; only the throttled call may back off
+    failures = 0
+    yfinance = logging.getLogger("yfinance")
+    # the back-off warnings would drown the report
+    logging.getLogger("rate_limit").setLevel(logging.ERROR)
+    for _ in range(rounds):
+        limiter = RateLimiter(rate=1000, burst=10, base_delay=0.01, max_delay=0.01)
+        started = threading.Barrier(2)
+
+        def throttled():
+            started.wait()
+            yfinance.error("1 Failed download: ['NVDA']: YFRateLimitError('Too Many Requests')")
+            time.sleep(0.02)
+            return "empty"
+
+        def healthy():
+            started.wait()
+            time.sleep(0.02)
+            return "bars"
+
+        threads = [threading.Thread(target=limiter.call, args=(fn,)) for fn in (throttled, healthy)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        yfinance.removeHandler(limiter._watcher)
+        failures += limiter.stats()["throttled"] != 1
+    return failures, rounds
+
+
+CHECKS = {
+    "scan_watchlist": check_scan_watchlist,
+    "chart_markers": check_chart_markers,
+    "throttle_attribution": check_throttle_attribution,
+}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--checks", help="comma-separated check names (default: all)")
+    args = parser.parse_args(argv)
+
+    selected = args.checks.split(",") if args.checks else list(CHECKS)
+    unknown = set(selected) - set(CHECKS)
+    if unknown:
+        parser.error(f"unknown checks: {', '.join(sorted(unknown))}")
+    failed = []
+    for name in selected:
+        failures, total = CHECKS[name]()
+        print(f"{name:<30} {failures}/{total} mismatches  {'FAIL' if failures else 'ok'}", flush=True)
+        if failures:
+            failed.append(name)
+    if failed:
+        print(f"{len(failed)} check(s) failed: " + ", ".join(failed))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,249 @@
+"""Timings for the indicator, signal, strike-filter and chart hot paths.
+
+    python benchmarks/hotpaths.py --json hotpaths.json
+    python benchmarks/hotpaths.py --baseline hotpaths.json --bars 1e3,1e5 --tickers 1,500
+    python benchmarks/hotpaths.py --cases get_macd,chart --bars 1e7
+
+Every case runs on synthetic one-minute bars in the layout yf.download
+returns: 390 bars per session, random-walk prices, America/New_York times.
+Bar cases are sized by --bars, watchlist cases by --tickers (one session of
+bars per symbol). With --baseline, each median is compared against the same
+case in an earlier --json report; the exit status is 1 when any case is slower
+than the baseline by more than --tolerance.
+"""
+import argparse
+import functools
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np  # noqa: E402
+import pandas as pd  # noqa: E402
+
+from charts import MacdChart, render_png  # noqa: E402
+from indicators import MacdEngine, VwapAccumulator, scan_watchlist  # noqa: E402
+from macd_core import check_cross, get_macd, get_vwap  # noqa: E402
+from option_chains import IndexedChain  # noqa: E402
+
+SESSION_BARS = 390
+
+
+@functools.lru_cache(maxsize=2)
+def synthetic_bars(bars, tickers=1, seed=0):
+    rng = np.random.default_rng(seed)
+    days = pd.bdate_range("2000-01-03", periods=-(-bars // SESSION_BARS))
+    minutes = pd.to_timedelta(np.arange(SESSION_BARS) + 9 * 60 + 30, unit="min")
+    index = (days.repeat(SESSION_BARS) + np.tile(minutes, len(days)))[:bars]
+    index = index.tz_localize("America/New_York").rename("Datetime")
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 1e-3, (bars, tickers)), axis=0))
+    spread = np.abs(rng.normal(0, 5e-4, (bars, tickers))) * close
+    volume = rng.integers(100, 10_000, (bars, tickers)).astype(float)
+    names = [f"T{i:04d}" for i in range(tickers)]
+    columns = pd.MultiIndex.from_product([["Close", "High", "Low", "Open", "Volume"], names],
+                                         names=["Price", "Ticker"])
+    values = np.hstack([close, close + spread, close - spread, close, volume])
+    return pd.DataFrame(values, index=index, columns=columns)
+
+
+def synthetic_chain(strikes, seed=0):
+    rng = np.random.default_rng(seed)
+    return pd.DataFrame({
+        "strike": rng.permutation(np.round(np.linspace(1, 1000, strikes), 2)),
+        "openInterest": rng.integers(0, 50_000, strikes).astype(float),
+        "lastPrice": rng.uniform(0.01, 50, strikes),
+    })
+
+
+# Each case takes its size and returns the call to time; setup stays untimed.
+def case_get_macd(bars):
+    data = synthetic_bars(bars)
+    return lambda: get_macd(data)
+
+
+def case_get_macd_engine(bars):
+    # a dashboard rerun: the engine already holds every bar, the last one is re-read
+    data = synthetic_bars(bars)
+    engine = MacdEngine().update(data["Close"])
+    return lambda: get_macd(data, engine)
+
+
+def case_check_cross_latest(bars):
+    # the alert CLI path: only the last two values leave the engine
+    data = synthetic_bars(bars)
+    engine = MacdEngine().update(data["Close"])
+    return lambda: check_cross(*engine.update(data["Close"]).latest(2))
+
+
+def case_get_vwap(bars):
+    data = synthetic_bars(bars)
+    return lambda: get_vwap(data)
+
+
+def case_get_vwap_accumulator(bars):
+    data = synthetic_bars(bars)
+    accumulator = VwapAccumulator().update(data)
+    return lambda: get_vwap(data, accumulator)
+
+
+def case_check_cross(bars):
+    macd, signal = get_macd(synthetic_bars(bars))
+    return lambda: check_cross(macd, signal)
+
+
+def case_strike_index(strikes):
+    chain = synthetic_chain(strikes)
+    return lambda: IndexedChain(chain)
+
+
+def case_near_strike(strikes):
+    chain = IndexedChain(synthetic_chain(strikes))
+    return lambda: chain.near_strike(500.0, pct=0.05, top=10)
+
+
+def case_chart(bars):
+    # full period through LTTB, the way the dashboard draws it
+    data = synthetic_bars(bars)
+    macd, signal = get_macd(data)
+    vwap = get_vwap(data)
+    chart = MacdChart()
+    return lambda: render_png(chart.update(data.index, macd, signal, vwap, max_points=800))
+
+
+def case_chart_window(bars):
+    data = synthetic_bars(bars)
+    macd, signal = get_macd(data)
+    vwap = get_vwap(data)
+    chart = MacdChart()
+    return lambda: render_png(chart.update(data.index, macd, signal, vwap, window=100))
+
+
+def split_tickers(tickers):
+    batch = synthetic_bars(SESSION_BARS, tickers)
+    return {ticker: batch.xs(ticker, axis=1, level="Ticker", drop_level=False)
+            for ticker in batch.columns.get_level_values("Ticker").unique()}
+
+
+def case_scan_watchlist(tickers):
+    frames = split_tickers(tickers)
+    return lambda: scan_watchlist(frames)
+
+
+def case_check_cross_each(tickers):
+    # the per-symbol path scan_watchlist replaces
+    frames = split_tickers(tickers)
+    return lambda: [check_cross(*get_macd(frame)) for frame in frames.values()]
+
+
+BAR_CASES = {
+    "get_macd": case_get_macd,
+    "get_macd/engine": case_get_macd_engine,
+    "get_vwap": case_get_vwap,
+    "get_vwap/accumulator": case_get_vwap_accumulator,
+    "check_cross": case_check_cross,
+    "check_cross/latest": case_check_cross_latest,
+    "strike_index": case_strike_index,
+    "near_strike": case_near_strike,
+    "chart": case_chart,
+    "chart/window": case_chart_window,
+}
+TICKER_CASES = {
+    "scan_watchlist": case_scan_watchlist,
+    "check_cross/each": case_check_cross_each,
+}
+
+
+def measure(call, repeat, budget):
+    # at least one run; stop early once a slow case has used up its budget
+    times = []
+    started = time.perf_counter()
+    while len(times) < repeat:
+        start = time.perf_counter()
+        call()
+        times.append(time.perf_counter() - start)
+        if time.perf_counter() - started > budget:
+            break
+    return times
+
+
+def sizes(text):
+    return [int(float(size)) for size in text.split(",") if size]
+
+
+def format_seconds(seconds):
+    if seconds < 1e-3:
+        return f"{seconds * 1e6:8.1f} us"
+    if seconds < 1:
+        return f"{seconds * 1e3:8.1f} ms"
+    return f"{seconds:8.2f} s "
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--bars", type=sizes, default=sizes("1e3,1e4,1e5,1e6,1e7"))
+    parser.add_argument("--tickers", type=sizes, default=sizes("1,10,100,1000,5000"))
+    parser.add_argument("--cases", help="comma-separated case names (default: all)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=10.0, help="seconds per case before repeats stop")
+    parser.add_argument("--json", dest="json_path")
+    parser.add_argument("--baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown against the baseline")
+    args = parser.parse_args(argv)
+
+    selected = set(args.cases.split(",")) if args.cases else None
+    unknown = (selected or set()) - set(BAR_CASES) - set(TICKER_CASES)
+    if unknown:
+        parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline) as fh:
+            baseline = json.load(fh)["results"]
+
+    plan = [(name, case, size) for name, case in BAR_CASES.items() for size in args.bars]
+    plan += [(name, case, size) for name, case in TICKER_CASES.items() for size in args.tickers]
+    results = {}
+    regressions = []
+    for name, case, size in plan:
+        if selected is not None and name not in selected:
+            continue
+        key = f"{name}[{size}]"
+        times = measure(case(size), args.repeat, args.budget)
+        median = statistics.median(times)
+        results[key] = {"median_s": median, "min_s": min(times), "runs": len(times)}
+        line = f"{key:<30} {format_seconds(median)}  (min {format_seconds(min(times)).strip()}, {len(times)} runs)"
+        previous = baseline.get(key)
+        if previous is not None:
+            ratio = median / previous["median_s"]
+            line += f"  {ratio:5.2f}x baseline"
+            if ratio > 1 + args.tolerance:
+                regressions.append(key)
+                line += "  REGRESSION"
+        print(line, flush=True)
+
+    if args.json_path:
+        report = {
+            "meta": {
+                "python": platform.python_version(),
+                "numpy": np.__version__,
+                "pandas": pd.__version__,
+                "machine": platform.machine(),
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            },
+            "results": results,
+        }
+        with open(args.json_path, "w") as fh:
+            json.dump(report, fh, indent=2)
+
+    if regressions:
+        print(f"{len(regressions)} case(s) slower than baseline by more than {args.tolerance:.0%}: "
+              + ", ".join(regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
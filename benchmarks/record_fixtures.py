@@ -0,0 +1,35 @@
+"""Record Yahoo Finance bars and option chains as replay fixtures.
+
+    python benchmarks/record_fixtures.py NVDA AAPL --interval 1m --out fixtures
+    MACD_DATA_PROVIDER=replay MACD_REPLAY_DIR=fixtures streamlit run macd_dashboard.py
+
+The fixtures are what ReplayProvider serves, so the dashboard, the alert CLI
+and the benchmarks can run on a machine without network access.
+"""
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from macd_core import period_for_interval  # noqa: E402
+from providers import YahooProvider, record_fixtures  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("symbols", nargs="+")
+    parser.add_argument("--interval", default="1m", choices=["1m", "5m", "15m", "1h"])
+    parser.add_argument("--period", help="defaults to the period the dashboard uses for the interval")
+    parser.add_argument("--expirations", type=int, help="record only the nearest N expiries (0 skips options)")
+    parser.add_argument("--format", choices=["parquet", "json"], default="parquet")
+    parser.add_argument("--out", default="fixtures")
+    args = parser.parse_args(argv)
+
+    period = args.period or period_for_interval(args.interval)
+    record_fixtures(YahooProvider(), args.out, args.symbols, args.interval, period,
+                    expirations=args.expirations, fmt=args.format)
+
+
+if __name__ == "__main__":
+    main()
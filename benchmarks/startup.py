@@ -0,0 +1,78 @@
+"""Cold-import cost of the app modules, measured with ``python -X importtime``.
+
+    python benchmarks/startup.py
+    python benchmarks/startup.py --json startup.json --repeat 5
+
+Each module is imported in a fresh interpreter; the report lists the
+cumulative import time of the module and its heaviest transitive imports, and
+flags heavy optional dependencies that got imported eagerly. Only imports the
+module itself triggered count, not what the interpreter loaded at startup.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODULES = [
+    "indicators", "bar_store", "providers", "option_chains", "alerts", "poller", "charts", "macd_core", "macd_alerts",
+]
+# these should only load on first use, never at import. pyarrow is listed even
+# though pandas 3 imports it itself, so the report shows what that costs.
+LAZY = ["yfinance", "matplotlib", "matplotlib.pyplot", "smtplib", "email.mime.text", "pyarrow"]
+
+
+def import_profile(module):
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+    )
+    lines = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        lines.append((name.strip(), int(self_us), int(cumulative_us), depth))
+    # children are printed before their parent, so the module's subtree is the run
+    # of deeper rows right above its own; site and .pth imports fall outside it
+    end = max(i for i, line in enumerate(lines) if line[0] == module and line[3] == 0)
+    start = end
+    while start > 0 and lines[start - 1][3] > 0:
+        start -= 1
+    return {name: (self_us, cumulative_us, depth) for name, self_us, cumulative_us, depth in lines[start:end + 1]}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--top", type=int, default=5)
+    parser.add_argument("--json", dest="json_path")
+    args = parser.parse_args(argv)
+
+    report = {}
+    for module in MODULES:
+        runs = [import_profile(module) for _ in range(args.repeat)]
+        cumulative = [run[module][1] for run in runs]
+        last = runs[-1]
+        # direct imports of the module, i.e. one level below it in the tree
+        heaviest = sorted(
+            ((name, cum) for name, (_, cum, depth) in last.items() if depth == 1),
+            key=lambda item: item[1], reverse=True,
+        )[:args.top]
+        eager = [name for name in LAZY if name in last]
+        report[module] = {"median_us": statistics.median(cumulative), "heaviest": heaviest, "eager": eager}
+        print(f"{module:<15} {statistics.median(cumulative) / 1000:8.1f} ms"
+              + (f"  eager: {', '.join(eager)}" if eager else ""))
+        for name, cum in heaviest:
+            print(f"    {name:<30} {cum / 1000:8.1f} ms")
+
+    if args.json_path:
+        with open(args.json_path, "w") as fh:
+            json.dump(report, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
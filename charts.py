@@ -0,0 +1,141 @@
+import hashlib
+import io
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def lttb_indices(values, threshold):
+    # Largest-Triangle-Three-Buckets over bar positions (not timestamps, so
+    # overnight gaps don't skew the buckets). Keeps the first and last bar.
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    positions = np.arange(n, dtype=float)
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=int)
+    selected[0] = 0
+    selected[-1] = n - 1
+    anchor = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], max(edges[bucket + 1], edges[bucket] + 1)
+        next_end = edges[bucket + 2] if bucket + 2 < len(edges) else n
+        next_end = max(next_end, end + 1)
+        avg_x = positions[end:next_end].mean()
+        avg_y = np.nanmean(values[end:next_end]) if np.isfinite(values[end:next_end]).any() else values[anchor]
+        area = np.abs(
+            (positions[anchor] - avg_x) * (values[start:end] - values[anchor])
+            - (positions[anchor] - positions[start:end]) * (avg_y - values[anchor])
+        )
+        area = np.where(np.isnan(area), -1.0, area)
+        anchor = start + int(np.argmax(area))
+        selected[bucket + 1] = anchor
+    return selected
+
+
+def downsample_indices(max_points, *series):
+    # every series gets an equal share of the budget; the union keeps each shape
+    share = max(3, max_points // max(1, len(series)))
+    return np.unique(np.concatenate([lttb_indices(values, share) for values in series]))
+
+
+def chart_fingerprint(ticker, interval, last_bar, window, *last_values):
+    # the last values catch a still-forming bar revised under the same timestamp
+    raw = repr((ticker, interval, str(last_bar), window, *(float(value) for value in last_values)))
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def render_png(fig):
+    # same savefig settings st.pyplot uses, so cached images look identical
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format="png", dpi=200, bbox_inches="tight")
+    return buffer.getvalue()
+
+
+class RenderedChartCache:
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self._images = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_render(self, key, render):
+        with self._lock:
+            image = self._images.get(key)
+            if image is not None:
+                self._images.move_to_end(key)
+                return image
+        image = render()
+        with self._lock:
+            self._images[key] = image
+            while len(self._images) > self.max_entries:
+                self._images.popitem(last=False)
+        return image
+
+
+class MacdChart:
+    # One figure per session whose artists are updated in place on each render.
+    # It is a bare Figure rather than plt.subplots, so nothing is parked in
+    # pyplot's global figure registry.
+    def __init__(self, figsize=(10, 5)):
+        # matplotlib only loads once a chart actually has to be drawn
+        from matplotlib.figure import Figure
+        self.fig = Figure(figsize=figsize)
+        self.ax = self.fig.subplots()
+        self._lines = None
+        self._bars = None
+
+    def update(self, index, macd, signal, vwap, buys=(), sells=(), window=None, max_points=None):
+        if window is not None:
+            index, macd, signal, vwap = index[-window:], macd[-window:], signal[-window:], vwap[-window:]
+        # markers take their height from every bar, not just the ones LTTB kept
+        marker_macd = macd
+        if max_points is not None and len(index) > max_points:
+            keep = downsample_indices(max_points, macd.to_numpy(), vwap.to_numpy())
+            index, macd, signal, vwap = index[keep], macd.iloc[keep], signal.iloc[keep], vwap.iloc[keep]
+        x = index
+        histogram = macd - signal
+
+        if self._lines is None:
+            self._create(x, macd, signal, vwap, histogram)
+        else:
+            self._lines["macd"].set_data(x, macd)
+            self._lines["signal"].set_data(x, signal)
+            self._lines["vwap"].set_data(x, vwap)
+            self._update_bars(x, histogram)
+        self._lines["buy"].set_data(buys, marker_macd.reindex(buys) if len(buys) else [])
+        self._lines["sell"].set_data(sells, marker_macd.reindex(sells) if len(sells) else [])
+
+        self.ax.relim()
+        self.ax.autoscale_view()
+        return self.fig
+
+    def close(self):
+        self.fig.clear()
+        self._lines = None
+        self._bars = None
+
+    def _create(self, x, macd, signal, vwap, histogram):
+        ax = self.ax
+        (macd_line,) = ax.plot(x, macd, label="MACD", color="blue")
+        (signal_line,) = ax.plot(x, signal, label="Signal", color="red")
+        (vwap_line,) = ax.plot(x, vwap, label="VWAP", color="orange", linestyle="--")
+        self._bars = ax.bar(x, histogram, color="gray", label="Histogram")
+        (buy_line,) = ax.plot([], [], marker="^", color="green", linestyle="none", zorder=3, label="Buy")
+        (sell_line,) = ax.plot([], [], marker="v", color="red", linestyle="none", zorder=3, label="Sell")
+        self._lines = {"macd": macd_line, "signal": signal_line, "vwap": vwap_line,
+                       "buy": buy_line, "sell": sell_line}
+        ax.legend()
+        ax.grid()
+
+    def _update_bars(self, x, histogram):
+        if len(self._bars) != len(x):
+            self._bars.remove()
+            self._bars = self.ax.bar(x, histogram, color="gray", label="Histogram")
+            return
+        import matplotlib.dates as mdates
+        positions = mdates.date2num(x)
+        for rect, position, height in zip(self._bars, positions, histogram):
+            rect.set_x(position - rect.get_width() / 2)
+            rect.set_height(height)
@@ -0,0 +1,416 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+
+def as_series(values):
+    # yf.download keeps a one-column (Price, Ticker) frame even for a single symbol
+    if isinstance(values, pd.DataFrame):
+        return values.iloc[:, 0]
+    return values
+
+
+def ema_step(prev, value, span):
+    alpha = 2.0 / (span + 1)
+    return prev + alpha * (value - prev)
+
+
+class MacdEngine:
+    # MACD and signal for every bar live in preallocated arrays aligned with the
+    # close series the engine was last given, next to the EMAs as of the last
+    # settled bar. An update finds that bar among the last few positions of the
+    # new series and only walks the bars after it. The newest bar is still
+    # forming, so its values are provisional and recomputed on every update.
+    # Missing closes get NaN and leave the EMAs untouched, the same result as
+    # computing on close.dropna() and reindexing.
+    SEARCH_DEPTH = 64
+
+    def __init__(self, fast=12, slow=26, signal=9):
+        self.fast = fast
+        self.slow = slow
+        self.signal = signal
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        # (timestamp ns, close, fast, slow, signal) of the last settled bar
+        self._state = None
+        self._macd = np.empty(0)
+        self._signal = np.empty(0)
+        self._start = 0
+        self._length = 0
+        self._index = None
+
+    def update(self, close):
+        close = as_series(close)
+        times = close.index.asi8
+        values = close.to_numpy(dtype=float)
+        with self._lock:
+            position = self._resume_position(times, values)
+            if position is None:
+                self._recompute(times, values)
+            else:
+                self._advance(times, values, position)
+            self._index = close.index
+        return self
+
+    def series(self):
+        with self._lock:
+            if self._index is None:
+                empty = pd.DatetimeIndex([])
+                return pd.Series(index=empty, dtype=float), pd.Series(index=empty, dtype=float)
+            end = self._start + len(self._index)
+            macd = self._macd[self._start:end].copy()
+            signal = self._signal[self._start:end].copy()
+            index = self._index
+        return pd.Series(macd, index=index), pd.Series(signal, index=index)
+
+    def latest(self, count=2):
+        # the last count bars with a value, without building the full series
+        with self._lock:
+            if self._index is None:
+                return np.empty(0), np.empty(0)
+            end = self._start + len(self._index)
+            begin = max(self._start, end - max(count, self.SEARCH_DEPTH))
+            macd = self._macd[begin:end]
+            signal = self._signal[begin:end]
+            valid = ~np.isnan(macd)
+            if valid.sum() < count and begin > self._start:
+                macd = self._macd[self._start:end]
+                signal = self._signal[self._start:end]
+                valid = ~np.isnan(macd)
+            return macd[valid][-count:].copy(), signal[valid][-count:].copy()
+
+    def _resume_position(self, times, values):
+        if self._state is None or len(values) < 2:
+            return None
+        timestamp, value = self._state[0], self._state[1]
+        lo = max(0, len(times) - self.SEARCH_DEPTH)
+        hits = np.flatnonzero(times[lo:] == timestamp)
+        if not len(hits):
+            return None
+        position = lo + int(hits[-1])
+        current = values[position]
+        if position == len(values) - 1 or not (current == value or (np.isnan(current) and np.isnan(value))):
+            # the settled bar is now the newest one, or it was revised upstream
+            return None
+        if self._length != position + 1:
+            # bars rolled off the front of the window, and the EMAs carried from
+            # them would no longer match a fresh computation on this series
+            return None
+        return position
+
+    def _reserve(self, size):
+        if self._start + size <= len(self._macd):
+            return
+        capacity = max(1024, 2 * size)
+        macd = np.empty(capacity)
+        signal = np.empty(capacity)
+        macd[:self._length] = self._macd[self._start:self._start + self._length]
+        signal[:self._length] = self._signal[self._start:self._start + self._length]
+        self._macd, self._signal, self._start = macd, signal, 0
+
+    def _recompute(self, times, values):
+        self.reset()
+        n = len(values)
+        if not n:
+            return
+        valid = ~np.isnan(values)
+        fast = np.full(n, np.nan)
+        slow = np.full(n, np.nan)
+        signal = np.full(n, np.nan)
+        if valid.any():
+            closes = pd.Series(values[valid])
+            fast[valid] = closes.ewm(span=self.fast, adjust=False).mean().to_numpy()
+            slow[valid] = closes.ewm(span=self.slow, adjust=False).mean().to_numpy()
+            macd = pd.Series(fast[valid] - slow[valid])
+            signal[valid] = macd.ewm(span=self.signal, adjust=False).mean().to_numpy()
+        self._reserve(n)
+        self._macd[:n] = fast - slow
+        self._signal[:n] = signal
+        self._length = n - 1
+        if n > 1:
+            # the EMAs carry over missing closes, so take them from the last valid settled bar
+            settled = np.flatnonzero(valid[:n - 1])
+            ema = (np.nan, np.nan, np.nan)
+            if len(settled):
+                last = settled[-1]
+                ema = (fast[last], slow[last], signal[last])
+            self._state = (times[n - 2], values[n - 2], *ema)
+
+    def _step(self, fast, slow, signal, value):
+        if np.isnan(value):
+            return fast, slow, signal, np.nan, np.nan
+        if np.isnan(fast):
+            # first valid close seeds the EMAs the way ewm(adjust=False) does
+            fast = slow = value
+            signal = 0.0
+        else:
+            fast = ema_step(fast, value, self.fast)
+            slow = ema_step(slow, value, self.slow)
+            signal = ema_step(signal, fast - slow, self.signal)
+        return fast, slow, signal, fast - slow, signal
+
+    def _advance(self, times, values, position):
+        _, _, fast, slow, signal = self._state
+        n = len(values)
+        self._reserve(n)
+        for row in range(position + 1, n - 1):
+            fast, slow, signal, macd_value, signal_value = self._step(fast, slow, signal, values[row])
+            self._macd[self._start + row] = macd_value
+            self._signal[self._start + row] = signal_value
+        if position + 1 < n - 1:
+            self._state = (times[n - 2], values[n - 2], fast, slow, signal)
+        self._length = n - 1
+        *_, macd_value, signal_value = self._step(fast, slow, signal, values[n - 1])
+        self._macd[self._start + n - 1] = macd_value
+        self._signal[self._start + n - 1] = signal_value
+
+
+def session_vwap(data):
+    high, low, close = as_series(data['High']), as_series(data['Low']), as_series(data['Close'])
+    volume = as_series(data['Volume'])
+    sessions = data.index.normalize()
+    price_volume = volume * (high + low + close) / 3
+    return price_volume.groupby(sessions).cumsum() / volume.groupby(sessions).cumsum()
+
+
+class VwapAccumulator:
+    # Session VWAP for every bar in a preallocated array aligned with the frame
+    # it was last given, next to the running (sum price*volume, sum volume) as
+    # of the last settled bar. Like MacdEngine, only bars after that one are
+    # walked and the newest bar is provisional. Bars missing a price or volume
+    # get NaN and don't touch the running sums.
+    SEARCH_DEPTH = 64
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        # (timestamp ns, price, volume, session, sum price*volume, sum volume) of the last settled bar
+        self._state = None
+        self._vwap = np.empty(0)
+        self._start = 0
+        self._length = 0
+        self._index = None
+
+    def update(self, data):
+        high = as_series(data['High']).to_numpy(dtype=float)
+        low = as_series(data['Low']).to_numpy(dtype=float)
+        close = as_series(data['Close']).to_numpy(dtype=float)
+        volume = as_series(data['Volume']).to_numpy(dtype=float)
+        index = data.index
+        with self._lock:
+            position = self._resume_position(index.asi8, high, low, close, volume)
+            if position is None:
+                self._recompute(index, (high + low + close) / 3, volume)
+            else:
+                self._advance(index, high, low, close, volume, position)
+            self._index = index
+        return self
+
+    def series(self):
+        with self._lock:
+            if self._index is None:
+                return pd.Series(index=pd.DatetimeIndex([]), dtype=float)
+            vwap = self._vwap[self._start:self._start + len(self._index)].copy()
+            index = self._index
+        return pd.Series(vwap, index=index)
+
+    def latest(self):
+        with self._lock:
+            if self._index is None:
+                return float("nan")
+            vwap = self._vwap[self._start:self._start + len(self._index)]
+            valid = np.flatnonzero(~np.isnan(vwap[-self.SEARCH_DEPTH:]))
+            if len(valid):
+                return float(vwap[-self.SEARCH_DEPTH:][valid[-1]])
+            valid = np.flatnonzero(~np.isnan(vwap))
+            return float(vwap[valid[-1]]) if len(valid) else float("nan")
+
+    def _resume_position(self, times, high, low, close, volume):
+        if self._state is None or len(times) < 2:
+            return None
+        timestamp, price, bar_volume = self._state[:3]
+        lo = max(0, len(times) - self.SEARCH_DEPTH)
+        hits = np.flatnonzero(times[lo:] == timestamp)
+        if not len(hits):
+            return None
+        position = lo + int(hits[-1])
+        if position == len(times) - 1:
+            return None
+        current = ((high[position] + low[position] + close[position]) / 3, volume[position])
+        if not all(a == b or (np.isnan(a) and np.isnan(b)) for a, b in zip(current, (price, bar_volume))):
+            return None
+        if self._length != position + 1:
+            # bars rolled off the front, so the first session's sums are stale
+            return None
+        return position
+
+    def _reserve(self, size):
+        if self._start + size <= len(self._vwap):
+            return
+        vwap = np.empty(max(1024, 2 * size))
+        vwap[:self._length] = self._vwap[self._start:self._start + self._length]
+        self._vwap, self._start = vwap, 0
+
+    def _recompute(self, index, price, volume):
+        self.reset()
+        n = len(price)
+        if not n:
+            return
+        valid = ~(np.isnan(price) | np.isnan(volume))
+        sessions = index[valid].normalize()
+        price_volume = pd.Series(price[valid] * volume[valid]).groupby(sessions).cumsum().to_numpy()
+        cumulative = pd.Series(volume[valid]).groupby(sessions).cumsum().to_numpy()
+        self._reserve(n)
+        self._vwap[:n] = np.nan
+        self._vwap[:n][valid] = price_volume / cumulative
+        self._length = n - 1
+        if n > 1:
+            # the running sums skip incomplete bars, so take them from the last valid settled bar
+            settled = np.flatnonzero(valid[:n - 1])
+            running = (None, 0.0, 0.0)
+            if len(settled):
+                last = len(settled) - 1
+                running = (sessions[last], float(price_volume[last]), float(cumulative[last]))
+            self._state = (index.asi8[n - 2], price[n - 2], volume[n - 2], *running)
+
+    def _step(self, session, price_volume, volume, timestamp, price, bar_volume):
+        if np.isnan(price) or np.isnan(bar_volume):
+            return session, price_volume, volume, np.nan
+        if timestamp.normalize() != session:
+            session, price_volume, volume = timestamp.normalize(), 0.0, 0.0
+        price_volume += price * bar_volume
+        volume += bar_volume
+        vwap = price_volume / volume if volume else float("nan")
+        return session, price_volume, volume, vwap
+
+    def _advance(self, index, high, low, close, volume, position):
+        session, price_volume, cumulative = self._state[3:]
+        n = len(index)
+        self._reserve(n)
+        for row in range(position + 1, n):
+            price = (high[row] + low[row] + close[row]) / 3
+            stepped = self._step(session, price_volume, cumulative, index[row], price, volume[row])
+            self._vwap[self._start + row] = stepped[3]
+            if row < n - 1:
+                session, price_volume, cumulative = stepped[:3]
+                self._state = (index.asi8[row], price, volume[row], session, price_volume, cumulative)
+        self._length = n - 1
+
+
+BUY_SIGNAL = "📈 BUY SIGNAL"
+SELL_SIGNAL = "📉 SELL SIGNAL"
+
+
+def crossover_directions(diff):
+    # +1 where macd - signal goes from below to above zero, -1 for the reverse.
+    # Works along axis 0, so a (bars, tickers) array is handled in the same pass.
+    diff = np.asarray(diff, dtype=float)
+    directions = np.zeros(diff.shape, dtype=np.int8)
+    if diff.shape[0] < 2:
+        return directions
+    prev, now = diff[:-1], diff[1:]
+    directions[1:][(prev < 0) & (now > 0)] = 1
+    directions[1:][(prev > 0) & (now < 0)] = -1
+    return directions
+
+
+def find_crossovers(macd, signal):
+    aligned = pd.concat([as_series(macd), as_series(signal)], axis=1).dropna()
+    directions = crossover_directions(aligned.iloc[:, 0].to_numpy() - aligned.iloc[:, 1].to_numpy())
+    hits = np.flatnonzero(directions)
+    labels = np.where(directions[hits] > 0, BUY_SIGNAL, SELL_SIGNAL)
+    return pd.Series(labels, index=aligned.index[hits], dtype=object)
+
+
+def ema_matrix(values, span):
+    # Column-wise EMA (adjust=False) over a (bars, tickers) array, seeded at each
+    # column's first valid value. Missing values leave the EMA untouched and come
+    # out as NaN, the same as running each column on its own dropna().
+    values = np.asarray(values, dtype=float)
+    ema = pd.DataFrame(values).ewm(span=span, adjust=False, ignore_na=True).mean().to_numpy()
+    return np.where(np.isnan(values), np.nan, ema)
+
+
+def last_valid_rows(values, count=2):
+    # row positions of each column's last count valid values, oldest first;
+    # -1 where a column has fewer than count
+    valid = ~np.isnan(values)
+    seen = np.cumsum(valid, axis=0)
+    total = seen[-1]
+    rows = np.full((count, values.shape[1]), -1)
+    for back in range(count):
+        # the first row at which the column has seen total - back valid values
+        target = total - back
+        hit = valid & (seen == target)
+        found = target > 0
+        rows[count - 1 - back, found] = np.argmax(hit[:, found], axis=0)
+    return rows
+
+
+def column_position(columns, label):
+    # first column under label in the top level, without materialising MultiIndex tuples
+    if isinstance(columns, pd.MultiIndex):
+        code = columns.levels[0].get_loc(label)
+        return int(np.flatnonzero(columns.codes[0] == code)[0])
+    return columns.get_loc(label)
+
+
+def close_matrix(frames):
+    # (bars, tickers) closes on the union of the frames' indexes, read by column
+    # position; frames sharing one index (one batch download) skip the alignment
+    tickers, closes, indexes = [], [], []
+    for ticker, frame in frames.items():
+        if frame is None or frame.empty:
+            continue
+        tickers.append(ticker)
+        closes.append(frame.to_numpy(dtype=float)[:, column_position(frame.columns, "Close")])
+        indexes.append(frame.index)
+    if not tickers:
+        return tickers, pd.DatetimeIndex([]), np.empty((0, 0))
+
+    index = indexes[0]
+    for other in indexes[1:]:
+        if other is not index and not other.equals(index):
+            index = index.union(other)
+    # no forward fill: symbols that stopped early must not get flat bars past their last one
+    values = np.full((len(index), len(tickers)), np.nan)
+    for column, (close, other) in enumerate(zip(closes, indexes)):
+        if other is index or other.equals(index):
+            values[:, column] = close
+        else:
+            values[index.get_indexer(other), column] = close
+    return tickers, index, values
+
+
+def scan_watchlist(frames, fast=12, slow=26, signal=9):
+    tickers, index, values = close_matrix(frames)
+    if not tickers:
+        return pd.DataFrame(columns=["Ticker", "Price", "MACD", "Signal", "Histogram", "Alert", "Last Bar"])
+
+    macd = ema_matrix(values, fast) - ema_matrix(values, slow)
+    signal_line = ema_matrix(macd, signal)
+    histogram = macd - signal_line
+
+    rows = last_valid_rows(values, 2)
+    columns = np.arange(values.shape[1])
+    last = rows[-1]
+    enough = rows[0] >= 0
+    directions = crossover_directions(np.stack([
+        histogram[rows[0], columns], histogram[last, columns],
+    ]))[-1]
+    alerts = np.where(directions > 0, BUY_SIGNAL, np.where(directions < 0, SELL_SIGNAL, "No crossover"))
+    alerts = np.where(enough, alerts, "No signal")
+    return pd.DataFrame({
+        "Ticker": tickers,
+        "Price": values[last, columns],
+        "MACD": macd[last, columns],
+        "Signal": signal_line[last, columns],
+        "Histogram": histogram[last, columns],
+        "Alert": alerts,
+        "Last Bar": index[last],
+    })
@@ -0,0 +1,161 @@
+import math
+
+import streamlit as st
+
+# Browser-side MACD/VWAP chart. The page keeps the bars it has already drawn;
+# each rerun only ships rows that are new or revised since the version the
+# browser holds, and Vega re-renders and zooms locally.
+LIVE_CHART_JS = """
+const VEGA_EMBED = "https://cdn.jsdelivr.net/npm/vega-embed@6/+esm";
+
+const SPEC = {
+  $schema: "https://vega.github.io/schema/vega-lite/v5.json",
+  width: "container",
+  height: 360,
+  data: { name: "bars" },
+  encoding: { x: { field: "t", type: "temporal", title: null } },
+  layer: [
+    {
+      mark: { type: "bar", color: "gray", opacity: 0.6 },
+      encoding: { y: { field: "hist", type: "quantitative", title: null } },
+    },
+    {
+      transform: [{ fold: ["macd", "signal", "vwap"], as: ["series", "value"] }],
+      mark: { type: "line", strokeWidth: 1.5 },
+      encoding: {
+        y: { field: "value", type: "quantitative" },
+        color: {
+          field: "series",
+          scale: { domain: ["macd", "signal", "vwap"], range: ["blue", "red", "orange"] },
+        },
+        strokeDash: {
+          field: "series",
+          scale: { domain: ["macd", "signal", "vwap"], range: [[1, 0], [1, 0], [4, 3]] },
+          legend: null,
+        },
+      },
+      params: [{ name: "zoom", select: "interval", bind: "scales" }],
+    },
+  ],
+};
+
+function toRow([t, macd, signal, vwap]) {
+  const hist = macd === null || signal === null ? null : macd - signal;
+  return { t, macd, signal, vwap, hist };
+}
+
+export default function (component) {
+  const { data, parentElement, setTriggerValue } = component;
+  if (!data) return;
+  let chart = parentElement.__macdChart;
+  if (!chart) {
+    const root = document.createElement("div");
+    root.style.width = "100%";
+    parentElement.appendChild(root);
+    chart = parentElement.__macdChart = { root, rows: [], version: 0, view: null };
+  }
+  if (data.version === chart.version) return;
+  if (!data.reset && data.base !== chart.version) {
+    // we missed a delta (e.g. the element was remounted); ask for a full snapshot
+    setTriggerValue("resync", data.version);
+    return;
+  }
+
+  const incoming = data.rows.map(toRow);
+  if (data.reset) {
+    chart.rows = incoming;
+  } else if (incoming.length) {
+    const first = incoming[0].t;
+    chart.rows = chart.rows.filter((row) => row.t < first).concat(incoming);
+  }
+  chart.rows = chart.rows.slice(-data.window);
+  chart.version = data.version;
+
+  const draw = () => chart.view.data("bars", chart.rows).runAsync();
+  if (chart.view) {
+    draw();
+  } else if (!chart.loading) {
+    chart.loading = import(VEGA_EMBED)
+      .then(({ default: embed }) => {
+        chart.root.textContent = "";
+        return embed(chart.root, SPEC, { actions: false });
+      })
+      .then((result) => {
+        chart.view = result.view;
+        draw();
+      })
+      .catch((error) => {
+        // e.g. offline or the CDN blocked; the next update tries again
+        chart.root.textContent = `Interactive chart unavailable: ${error.message || error}`;
+        chart.loading = null;
+      });
+  }
+}
+"""
+
+_live_chart = None
+
+
+def _component():
+    global _live_chart
+    if _live_chart is None:
+        _live_chart = st.components.v2.component("macd_live_chart", js=LIVE_CHART_JS)
+    return _live_chart
+
+
+def _number(value):
+    value = float(value)
+    return None if math.isnan(value) else round(value, 6)
+
+
+class LiveChartFeed:
+    # Per-session record of what the browser holds, used to turn the current
+    # bars into either a full snapshot or a delta against the last version sent.
+    def __init__(self, window=100):
+        self.window = window
+        self.series_key = None
+        self.version = 0
+        self.last_row = None
+        self.needs_reset = True
+        self._payload = None
+
+    def payload(self, series_key, index, macd, signal, vwap):
+        index = index[-self.window:]
+        timestamps = [int(ts.value // 1_000_000) for ts in index]
+        rows = [
+            [ts, _number(m), _number(s), _number(v)]
+            for ts, m, s, v in zip(timestamps, macd[-self.window:], signal[-self.window:], vwap[-self.window:])
+        ]
+        if not rows:
+            return None
+
+        reset = self.needs_reset or series_key != self.series_key or self.last_row is None
+        if not reset:
+            if rows[-1] == self.last_row and self._payload is not None:
+                return self._payload
+            # resend from the previously last bar on; it was still forming then
+            start = next((i for i, row in enumerate(rows) if row[0] >= self.last_row[0]), None)
+            reset = start is None or rows[start][0] != self.last_row[0]
+
+        self._payload = {
+            "version": self.version + 1,
+            "base": self.version,
+            "reset": reset,
+            "rows": rows if reset else rows[start:],
+            "window": self.window,
+        }
+        self.version += 1
+        self.series_key = series_key
+        self.last_row = rows[-1]
+        self.needs_reset = False
+        return self._payload
+
+    def request_reset(self):
+        self.needs_reset = True
+
+
+def render_live_chart(feed, series_key, index, macd, signal, vwap, key="macd_live_chart"):
+    payload = feed.payload(series_key, index, macd, signal, vwap)
+    if payload is None:
+        return
+    _component()(data=payload, key=key, on_resync_change=feed.request_reset)
@@ -0,0 +1,85 @@
+import argparse
+import logging
+import os
+import time
+
+from alerts import EmailAlertDispatcher
+from indicators import MacdEngine, as_series
+from macd_core import (
+    build_alert_store,
+    build_bar_store,
+    check_cross,
+    format_price,
+    period_for_interval,
+    send_email_alert,
+)
+
+logger = logging.getLogger("macd_alerts")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scan a watchlist for MACD crossovers and email alerts without Streamlit.")
+    parser.add_argument("symbols", nargs="+", help="ticker symbols to watch")
+    parser.add_argument("--interval", default="1m", choices=["1m", "5m", "15m", "1h"])
+    parser.add_argument("--every", type=int, default=60, help="seconds between scans")
+    parser.add_argument("--once", action="store_true", help="scan once and exit")
+    parser.add_argument("--to", dest="to_email", help="recipient address; alerts are only logged without it")
+    parser.add_argument("--from", dest="from_email", help="sender address")
+    parser.add_argument("--smtp-host", default="smtp.gmail.com")
+    parser.add_argument("--smtp-port", type=int, default=465)
+    parser.add_argument("--no-ssl", action="store_true", help="plain SMTP, e.g. against a local test server")
+    args = parser.parse_args(argv)
+    if args.to_email and not args.from_email:
+        parser.error("--to requires --from")
+    # a plain local test server (--no-ssl) takes mail without logging in
+    if args.to_email and not args.no_ssl and not os.environ.get("MACD_SMTP_PASSWORD"):
+        parser.error("--to requires the sender's password in MACD_SMTP_PASSWORD")
+    return args
+
+
+def scan(store, engines, alert_store, dispatcher, args):
+    period = period_for_interval(args.interval)
+    frames = store.get_many(args.symbols, args.interval, period)
+    password = os.environ.get("MACD_SMTP_PASSWORD")
+    for ticker, data in frames.items():
+        if data is None or data.empty:
+            logger.warning("No data loaded for %s", ticker)
+            continue
+        engine = engines.setdefault(ticker, MacdEngine())
+        # only the last two bars matter here, so skip building the full series
+        alert = check_cross(*engine.update(data['Close']).latest(2))
+        close = as_series(data['Close'])
+        price_display = format_price(close.iloc[-1])
+        logger.info("%s %s | %s", ticker, price_display, alert)
+        if not args.to_email or ("BUY" not in alert and "SELL" not in alert):
+            continue
+        bar_time = close.last_valid_index()
+        send_email_alert(dispatcher, alert_store, ticker, args.interval, bar_time, alert, price_display,
+                         args.to_email, args.from_email, password)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    args.symbols = list(dict.fromkeys(symbol.upper() for symbol in args.symbols))
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    store = build_bar_store()
+    alert_store = build_alert_store()
+    dispatcher = EmailAlertDispatcher(args.smtp_host, args.smtp_port, use_ssl=not args.no_ssl)
+    engines = {}
+    try:
+        while True:
+            started = time.monotonic()
+            scan(store, engines, alert_store, dispatcher, args)
+            if args.once:
+                break
+            time.sleep(max(0.0, args.every - (time.monotonic() - started)))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        dispatcher.flush(timeout=30)
+        dispatcher.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from alerts import AlertStore, EmailAlertDispatcher
+from bar_store import ArrowBarCache, BarStore, DiskBarCache
+from indicators import BUY_SIGNAL, SELL_SIGNAL, as_series, crossover_directions, session_vwap
+from providers import ReplayProvider, YahooProvider
+
+
+def period_for_interval(interval):
+    return "1d" if interval == "1m" else "5d"
+
+
+def build_provider():
+    # MACD_DATA_PROVIDER=replay serves recorded fixtures from MACD_REPLAY_DIR
+    if os.environ.get("MACD_DATA_PROVIDER", "yahoo") == "replay":
+        return ReplayProvider(
+            os.environ.get("MACD_REPLAY_DIR", "fixtures"),
+            latency=float(os.environ.get("MACD_REPLAY_LATENCY", "0")),
+            jitter=float(os.environ.get("MACD_REPLAY_JITTER", "0")),
+        )
+    return YahooProvider()
+
+
+def build_bar_store(provider=None):
+    cache_dir = os.environ.get("MACD_BAR_CACHE_DIR", ".bar_cache")
+    retention_days = int(os.environ.get("MACD_BAR_CACHE_RETENTION_DAYS", "7"))
+    shared_dir = os.environ.get("MACD_SHARED_BAR_DIR", os.path.join(cache_dir, "shared"))
+    # e.g. MACD_BAR_TTL="1m=20,1h=600" overrides the per-interval defaults
+    ttl = {
+        interval.strip(): float(seconds)
+        for interval, seconds in (
+            item.split("=", 1) for item in os.environ.get("MACD_BAR_TTL", "").split(",") if "=" in item
+        )
+    }
+    # bars held in memory, memory-mapped or not, are capped at this many megabytes
+    max_bytes = int(os.environ.get("MACD_BAR_MEMORY_MB", "256")) * 1024 * 1024
+    return BarStore(
+        provider or build_provider(),
+        disk=DiskBarCache(cache_dir, retention_days=retention_days),
+        shared=ArrowBarCache(shared_dir, max_bytes=max_bytes),
+        ttl=ttl,
+        max_bytes=max_bytes,
+    )
+
+
+def build_alert_store():
+    return AlertStore(os.environ.get("MACD_ALERT_DB", "alerts.sqlite3"))
+
+
+def build_alert_dispatcher():
+    return EmailAlertDispatcher("smtp.gmail.com", 465)
+
+
+def get_macd(data, engine=None):
+    if engine is None:
+        close = as_series(data['Close'])
+        exp1 = close.ewm(span=12, adjust=False).mean()
+        exp2 = close.ewm(span=26, adjust=False).mean()
+        macd = exp1 - exp2
+        signal = macd.ewm(span=9, adjust=False).mean()
+        return macd, signal
+    # the engine's series are already aligned with data.index
+    return engine.update(data['Close']).series()
+
+
+def get_vwap(data, accumulator=None):
+    if accumulator is None:
+        return session_vwap(data)
+    return accumulator.update(data).series()
+
+
+def check_cross(macd, signal):
+    # takes Series or the arrays MacdEngine.latest returns
+    try:
+        macd = np.asarray(macd, dtype=float)
+        signal = np.asarray(signal, dtype=float)
+    except Exception:
+        return "No signal"
+    macd = macd[~np.isnan(macd)]
+    signal = signal[~np.isnan(signal)]
+    if len(macd) < 2 or len(signal) < 2:
+        return "No signal"
+    direction = crossover_directions(macd[-2:] - signal[-2:])[-1]
+    if direction > 0:
+        return BUY_SIGNAL
+    elif direction < 0:
+        return SELL_SIGNAL
+    else:
+        return "No crossover"
+
+
+def format_price(last_price):
+    return f"${last_price:.2f}" if last_price is not None and not pd.isna(last_price) else "N/A"
+
+
+def send_email_alert(dispatcher, alert_store, ticker, interval, bar_time, alert, price_display,
+                     to_email, from_email, password):
+    # returns False when this crossover already fired for the bar and recipient
+    if not alert_store.record(ticker, interval, bar_time, alert, to_email, price_display):
+        return False
+    subject = f"{ticker} {alert}"
+    body = f"{ticker} triggered a {alert} at {price_display}"
+    dispatcher.send(subject, body, to_email, from_email, password,
+                    on_failure=lambda error: alert_store.forget(ticker, interval, bar_time, alert, to_email))
+    return True
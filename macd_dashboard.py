@@ -1,10 +1,21 @@
 import streamlit as st
-import yfinance as yf
 import pandas as pd
-import matplotlib.pyplot as plt
-import smtplib
-from email.mime.text import MIMEText
-import time
+
+import macd_core
+from indicators import (
+    BUY_SIGNAL,
+    SELL_SIGNAL,
+    MacdEngine,
+    VwapAccumulator,
+    as_series,
+    find_crossovers,
+    scan_watchlist,
+)
+from charts import MacdChart, RenderedChartCache, chart_fingerprint, render_png
+from macd_core import check_cross, format_price, period_for_interval
+from option_chains import OptionChainPrefetcher
+from poller import MarketDataPoller
+from rate_limit import default_limiter
 
 st.set_page_config(layout="wide")
 
@@ -12,7 +23,7 @@ st.title("📊 MACD + VWAP + Option Chain Dashboard with Strike Filter, Expiry S
 
 ticker_input = st.text_input("Enter stock symbol (e.g., NVDA)", value="NVDA").upper()
 interval = st.selectbox("Select Interval", ["1m", "5m", "15m", "1h"], index=0)
-duration = "1d" if interval == "1m" else "5d"
+duration = period_for_interval(interval)
 
 st.sidebar.header("🔔 Email Alerts (Optional)")
 email_alert = st.sidebar.checkbox("Enable Email Alerts")
@@ -20,67 +31,126 @@ recipient_email = st.sidebar.text_input("Recipient Email")
 sender_email = st.sidebar.text_input("Sender Email (Gmail)")
 sender_password = st.sidebar.text_input("App Password", type="password")
 
+st.sidebar.header("📈 Chart")
+chart_backend = st.sidebar.radio("Chart rendering", ["Static image", "Interactive (browser)"], index=0)
+full_history = st.sidebar.checkbox("Show full period (downsampled)")
+# the static chart is ~1000px wide, so more points than this are never visible
+chart_window = None if full_history else 100
+chart_max_points = 800
+
+st.sidebar.header("📋 Watchlist Scanner")
+watchlist_input = st.sidebar.text_area("Symbols (comma or space separated)", value="")
+watchlist = list(dict.fromkeys(symbol.upper() for symbol in watchlist_input.replace(",", " ").split()))
+
 st.sidebar.header("⏱️ Auto-Refresh")
 auto_refresh = st.sidebar.checkbox("Enable Auto-Refresh")
 refresh_rate = st.sidebar.slider("Refresh every (seconds)", min_value=30, max_value=300, value=60, step=30)
+# fragments rerun on this schedule on their own; nothing holds a server thread between ticks
+refresh_every = refresh_rate if auto_refresh else None
+
+@st.cache_resource
+def get_provider():
+    return macd_core.build_provider()
+
+@st.cache_resource
+def get_bar_store():
+    return macd_core.build_bar_store(get_provider())
+
+@st.cache_resource
+def get_poller():
+    # each interval refreshes on its bar-store TTL (MACD_BAR_TTL)
+    return MarketDataPoller(get_bar_store())
 
-@st.cache_data(ttl=60)
 def load_data(ticker):
-    return yf.download(ticker, period=duration, interval=interval, progress=False)
+    # the process-wide poller fetches each symbol once per tick for every session
+    return get_poller().latest(ticker, interval, duration)
+
+@st.cache_resource
+def get_option_prefetcher():
+    return OptionChainPrefetcher(get_provider(), max_workers=4, ttl=300)
 
-@st.cache_data(ttl=600)
 def load_option_data(ticker):
     try:
-        stock = yf.Ticker(ticker)
-        return stock.options, stock
+        return get_option_prefetcher().expirations(ticker)
     except Exception:
-        return [], None
+        return ()
+
+@st.cache_resource
+def get_macd_engine(ticker, interval):
+    return MacdEngine(fast=12, slow=26, signal=9)
 
 def get_macd(data):
-    exp1 = data['Close'].ewm(span=12, adjust=False).mean()
-    exp2 = data['Close'].ewm(span=26, adjust=False).mean()
-    macd = exp1 - exp2
-    signal = macd.ewm(span=9, adjust=False).mean()
-    return macd, signal
+    return macd_core.get_macd(data, get_macd_engine(ticker_input, interval))
+
+@st.cache_resource
+def get_vwap_accumulator(ticker, interval):
+    return VwapAccumulator()
 
 def get_vwap(data):
-    cum_vol_price = (data['Volume'] * (data['High'] + data['Low'] + data['Close']) / 3).cumsum()
-    cum_vol = data['Volume'].cumsum()
-    return cum_vol_price / cum_vol
-
-def check_cross(macd, signal):
-    macd = macd.dropna()
-    signal = signal.dropna()
-    if len(macd) < 2 or len(signal) < 2:
-        return "No signal"
-    try:
-        macd_prev = float(macd.iloc[-2])
-        macd_now = float(macd.iloc[-1])
-        sig_prev = float(signal.iloc[-2])
-        sig_now = float(signal.iloc[-1])
-
-        if macd_prev < sig_prev and macd_now > sig_now:
-            return "📈 BUY SIGNAL"
-        elif macd_prev > sig_prev and macd_now < sig_now:
-            return "📉 SELL SIGNAL"
-        else:
-            return "No crossover"
-    except Exception:
-        return "No signal"
+    return macd_core.get_vwap(data, get_vwap_accumulator(ticker_input, interval))
 
-def send_email_alert(subject, body, to_email, from_email, password):
-    try:
-        msg = MIMEText(body)
-        msg["Subject"] = subject
-        msg["From"] = from_email
-        msg["To"] = to_email
-        with smtplib.SMTP_SSL("smtp.gmail.com", 465) as server:
-            server.login(from_email, password)
-            server.sendmail(from_email, to_email, msg.as_string())
-    except Exception as e:
-        st.sidebar.error(f"Email failed: {e}")
-
-def render_dashboard():
+@st.fragment(run_every=refresh_every)
+def render_watchlist():
+    if not watchlist:
+        return
+    frames = get_poller().latest_many(watchlist, interval, duration)
+    scan = scan_watchlist(frames)
+    missing = [ticker for ticker in watchlist if ticker not in set(scan["Ticker"])]
+
+    st.markdown("### 📋 Watchlist Signals")
+    st.dataframe(scan.sort_values(["Alert", "Histogram"], ascending=[False, False]), hide_index=True)
+    if missing:
+        st.warning(f"No data loaded for: {', '.join(missing)}")
+
+@st.cache_resource
+def get_alert_dispatcher():
+    return macd_core.build_alert_dispatcher()
+
+@st.cache_resource
+def get_alert_store():
+    return macd_core.build_alert_store()
+
+def get_macd_chart():
+    # one figure per session, redrawn in place instead of a new figure per render
+    if "macd_chart" not in st.session_state:
+        st.session_state["macd_chart"] = MacdChart()
+    return st.session_state["macd_chart"]
+
+@st.cache_resource
+def get_chart_cache():
+    return RenderedChartCache(max_entries=256)
+
+def render_macd_chart(data, macd, signal, vwap):
+    key = chart_fingerprint(ticker_input, interval, data.index[-1], chart_window or "full",
+                            macd.iloc[-1], signal.iloc[-1], vwap.iloc[-1])
+
+    def render():
+        shown = slice(-chart_window, None) if chart_window else slice(None)
+        crossovers = find_crossovers(macd[shown], signal[shown])
+        buys = crossovers.index[crossovers == BUY_SIGNAL]
+        sells = crossovers.index[crossovers == SELL_SIGNAL]
+        chart = get_macd_chart()
+        return render_png(chart.update(data.index, macd, signal, vwap, buys, sells,
+                                       window=chart_window, max_points=chart_max_points))
+
+    return get_chart_cache().get_or_render(key, render)
+
+def render_interactive_chart(data, macd, signal, vwap):
+    from live_chart import LiveChartFeed, render_live_chart
+    # the static figure isn't drawn any more; free it rather than keep it per session
+    static_chart = st.session_state.pop("macd_chart", None)
+    if static_chart is not None:
+        static_chart.close()
+    if "live_chart_feed" not in st.session_state:
+        st.session_state["live_chart_feed"] = LiveChartFeed(window=100)
+    render_live_chart(st.session_state["live_chart_feed"], (ticker_input, interval), data.index, macd, signal, vwap)
+
+def show_email_errors(from_email):
+    for error in get_alert_dispatcher().drain_errors(from_email):
+        st.sidebar.error(f"Email failed: {error}")
+
+@st.fragment(run_every=refresh_every)
+def render_market_data():
     data = load_data(ticker_input)
     if data.empty:
         st.error("No data loaded for this ticker.")
@@ -89,58 +159,68 @@ def render_dashboard():
     macd, signal = get_macd(data)
     vwap = get_vwap(data)
     alert = check_cross(macd, signal)
-    last_price = data['Close'].iloc[-1]
-    price_display = f"${last_price:.2f}" if last_price is not None and not pd.isna(last_price) else "N/A"
+    last_price = as_series(data['Close']).iloc[-1]
+    price_display = format_price(last_price)
 
     st.subheader(f"{ticker_input} – Price: {price_display} | {alert}")
-    fig, ax = plt.subplots(figsize=(10, 5))
-    ax.plot(data.index[-100:], macd[-100:], label="MACD", color="blue")
-    ax.plot(data.index[-100:], signal[-100:], label="Signal", color="red")
-    ax.plot(data.index[-100:], vwap[-100:], label="VWAP", color="orange", linestyle="--")
-    ax.bar(data.index[-100:], (macd - signal)[-100:], color="gray", label="Histogram")
-    ax.legend()
-    ax.grid()
-    st.pyplot(fig)
-
-    expirations, stock = load_option_data(ticker_input)
-    if not expirations or stock is None:
+    upstream = default_limiter().stats()
+    if upstream["queue_depth"] or upstream["paused_for"]:
+        st.caption(f"Yahoo Finance is throttling: {upstream['queue_depth']} requests queued, "
+                   f"backing off {upstream['paused_for']:.0f}s")
+    if chart_backend == "Interactive (browser)":
+        render_interactive_chart(data, macd, signal, vwap)
+    else:
+        st.image(render_macd_chart(data, macd, signal, vwap), width="stretch")
+
+    if email_alert and ("BUY" in alert or "SELL" in alert):
+        # delivery happens on the dispatcher's worker; failures surface on the next rerun
+        bar_time = macd.dropna().index[-1]
+        macd_core.send_email_alert(get_alert_dispatcher(), get_alert_store(), ticker_input, interval, bar_time,
+                                   alert, price_display, recipient_email, sender_email, sender_password)
+    if email_alert:
+        show_email_errors(sender_email)
+        history = get_alert_store().history(ticker_input, recipient=recipient_email, limit=20)
+        if history:
+            with st.sidebar.expander("Alert history"):
+                st.dataframe(pd.DataFrame(history).drop(columns=["recipient", "fired_at"]), hide_index=True)
+
+@st.fragment
+def render_option_chain():
+    data = load_data(ticker_input)
+    if data.empty:
+        return
+    last_price = as_series(data['Close']).iloc[-1]
+
+    expirations = load_option_data(ticker_input)
+    if not expirations:
         st.warning("Option data unavailable.")
         return
 
     expiry = st.selectbox("Select Expiration", expirations)
+    prefetcher = get_option_prefetcher()
     try:
-        chain = stock.option_chain(expiry)
-        calls = chain.calls
-        puts = chain.puts
+        # the selected expiry skips the shared prefetch queue
+        calls, puts = prefetcher.get(ticker_input, expiry, timeout=20)
     except Exception:
         st.error("Could not load option chain.")
         return
+    finally:
+        prefetcher.prefetch(ticker_input, expirations)
 
     st.markdown("### 📈 Call Options Near Strike")
     if not calls.empty:
         st.markdown("Filtered within ±5% of current price.")
-        near_calls = calls[calls['strike'].between(last_price * 0.95, last_price * 1.05)]
-        st.dataframe(near_calls.sort_values("openInterest", ascending=False).head(10))
+        st.dataframe(calls.near_strike(last_price, pct=0.05, top=10))
     else:
         st.warning("No call options found.")
 
     st.markdown("### 📉 Put Options Near Strike")
     if not puts.empty:
         st.markdown("Filtered within ±5% of current price.")
-        near_puts = puts[puts['strike'].between(last_price * 0.95, last_price * 1.05)]
-        st.dataframe(near_puts.sort_values("openInterest", ascending=False).head(10))
+        st.dataframe(puts.near_strike(last_price, pct=0.05, top=10))
     else:
         st.warning("No put options found.")
 
-    if email_alert and ("BUY" in alert or "SELL" in alert):
-        subject = f"{ticker_input} {alert}"
-        body = f"{ticker_input} triggered a {alert} at {price_display}"
-        send_email_alert(subject, body, recipient_email, sender_email, sender_password)
-
-if auto_refresh:
-    while True:
-        render_dashboard()
-        time.sleep(refresh_rate)
-        st.rerun()
-else:
-    render_dashboard()
+render_market_data()
+render_option_chain()
+render_watchlist()
@@ -0,0 +1,121 @@
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from singleflight import SingleFlight
+
+
+class IndexedChain:
+    # One side of an option chain sorted by strike once at fetch time, with the
+    # open-interest ranking precomputed, so a strike window is two binary
+    # searches plus a sort of just the rows inside it.
+    def __init__(self, frame):
+        self.frame = frame.sort_values("strike", kind="stable")
+        self.strikes = self.frame["strike"].to_numpy(dtype=float)
+        self.oi_rank = (
+            self.frame["openInterest"].rank(method="first", ascending=False, na_option="bottom")
+            .to_numpy(dtype=float)
+        )
+
+    @property
+    def empty(self):
+        return self.frame.empty
+
+    def near_strike(self, price, pct=0.05, top=10):
+        lo = np.searchsorted(self.strikes, price * (1 - pct), side="left")
+        hi = np.searchsorted(self.strikes, price * (1 + pct), side="right")
+        order = np.argsort(self.oi_rank[lo:hi], kind="stable")[:top]
+        return self.frame.iloc[lo:hi].iloc[order]
+
+
+class OptionChainPrefetcher:
+    # Background prefetches share one FIFO pool across sessions. A chain a user
+    # is waiting on skips that queue and runs on a small pool of its own. Each
+    # prefetch covers only the nearest per_ticker expiries, so a few sessions on
+    # different symbols fit in max_entries without evicting each other's chains.
+    def __init__(self, provider, max_workers=4, ttl=300, expirations_ttl=600, max_entries=64, per_ticker=None):
+        self.provider = provider
+        self.ttl = ttl
+        self.expirations_ttl = expirations_ttl
+        self.max_entries = max_entries
+        self.per_ticker = per_ticker or max(1, max_entries // 4)
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="option-chain")
+        self._foreground = ThreadPoolExecutor(max_workers=2, thread_name_prefix="option-chain-now")
+        self._chains = OrderedDict()
+        self._expirations = {}
+        self._flights = SingleFlight()
+        # reentrant: cancelling a queued future runs _evict_failed on this thread
+        self._lock = threading.RLock()
+
+    def expirations(self, ticker):
+        with self._lock:
+            entry = self._expirations.get(ticker)
+        if entry is not None and time.monotonic() - entry[1] < self.expirations_ttl:
+            return entry[0]
+        # concurrent misses for one ticker share a single lookup
+        return self._flights.do(ticker, lambda: self._load_expirations(ticker))
+
+    def _load_expirations(self, ticker):
+        expirations = tuple(self.provider.expirations(ticker))
+        with self._lock:
+            self._expirations[ticker] = (expirations, time.monotonic())
+        return expirations
+
+    def prefetch(self, ticker, expirations):
+        for expiry in list(dict.fromkeys(expirations))[:self.per_ticker]:
+            self._submit(ticker, expiry, self._executor)
+
+    def get(self, ticker, expiry, timeout=30):
+        return self._submit(ticker, expiry, self._foreground).result(timeout)
+
+    def _submit(self, ticker, expiry, executor):
+        key = (ticker, expiry)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._chains.get(key)
+            if entry is not None:
+                future, submitted_at = entry
+                fresh = not future.done() or now - submitted_at < self.ttl
+                # a prefetch still queued behind other sessions' work is pulled forward
+                promote = executor is self._foreground and not future.running() and future.cancel()
+                if fresh and not promote:
+                    self._chains.move_to_end(key)
+                    return future
+                self._chains.pop(key, None)
+            future = executor.submit(self._fetch_chain, ticker, expiry)
+            self._chains[key] = (future, now)
+            self._trim(now)
+        future.add_done_callback(lambda f: self._evict_failed(key, f))
+        return future
+
+    def _trim(self, now):
+        finished = [key for key, (future, _) in self._chains.items() if future.done()]
+        expired = [key for key in finished if now - self._chains[key][1] >= self.ttl]
+        for key in expired:
+            del self._chains[key]
+        # whole tickers go, least recently used first, so one symbol's prefetch never
+        # evicts another symbol's chains piecemeal; in-flight ones are never dropped
+        tickers = list(dict.fromkeys(ticker for ticker, _ in reversed(self._chains)))
+        while len(self._chains) > self.max_entries and len(tickers) > 1:
+            ticker = tickers.pop()
+            for key in [key for key in finished if key[0] == ticker and key in self._chains]:
+                del self._chains[key]
+
+    def _fetch_chain(self, ticker, expiry):
+        calls, puts = self.provider.option_chain(ticker, expiry)
+        return IndexedChain(calls), IndexedChain(puts)
+
+    def _evict_failed(self, key, future):
+        if not future.cancelled() and future.exception() is None:
+            return
+        with self._lock:
+            entry = self._chains.get(key)
+            if entry is not None and entry[0] is future:
+                del self._chains[key]
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._foreground.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,112 @@
+import logging
+import threading
+import time
+from collections import defaultdict
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class MarketDataPoller:
+    # One thread per process owns the refresh schedule for every (ticker, interval,
+    # period) any session is watching. Each interval is polled every
+    # store.ttl_for(interval) seconds (or poll_seconds when given), on ticks
+    # aligned to the wall clock, so all subscribers of a symbol share one fetch
+    # per tick. Sessions hold a lease that they renew on every read; symbols
+    # nobody renewed drop out of the schedule.
+    def __init__(self, store, poll_seconds=None, lease_seconds=300):
+        self.store = store
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+        self._leases = {}
+        self._next_poll = {}
+        self._latest = {}
+        self._cond = threading.Condition()
+        self._stopped = threading.Event()
+        self._thread = None
+
+    def subscribe(self, tickers, interval, period):
+        expires = time.monotonic() + self.lease_seconds
+        with self._cond:
+            for ticker in tickers:
+                self._leases[(ticker, interval, period)] = expires
+            self._cond.notify_all()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="market-data-poller", daemon=True)
+                self._thread.start()
+
+    def latest_many(self, tickers, interval, period, timeout=30):
+        tickers = list(dict.fromkeys(tickers))
+        keys = [(ticker, interval, period) for ticker in tickers]
+        self.subscribe(tickers, interval, period)
+        with self._cond:
+            self._cond.wait_for(lambda: all(key in self._latest for key in keys), timeout)
+            entries = [self._latest.get(key) for key in keys]
+        return {
+            ticker: data if data is not None else pd.DataFrame()
+            for ticker, data in zip(tickers, entries)
+        }
+
+    def latest(self, ticker, interval, period, timeout=30):
+        return self.latest_many([ticker], interval, period, timeout)[ticker]
+
+    def stop(self):
+        self._stopped.set()
+        with self._cond:
+            self._cond.notify_all()
+
+    def interval_seconds(self, interval):
+        return self.poll_seconds or self.store.ttl_for(interval)
+
+    def _run(self):
+        while not self._stopped.is_set():
+            now = time.time()
+            with self._cond:
+                self._expire_leases()
+                due = [
+                    key for key in self._leases
+                    if key not in self._latest or self._next_poll.get(key, 0.0) <= now
+                ]
+                for key in due:
+                    seconds = self.interval_seconds(key[1])
+                    self._next_poll[key] = (now // seconds + 1) * seconds
+            if due:
+                self._poll(due)
+            with self._cond:
+                if not self._unfetched() and not self._stopped.is_set():
+                    wake = min((self._next_poll.get(key, 0.0) for key in self._leases), default=time.time() + 60)
+                    self._cond.wait(timeout=max(0.0, wake - time.time()))
+
+    def _unfetched(self):
+        return [key for key in self._leases if key not in self._latest]
+
+    def _expire_leases(self):
+        now = time.monotonic()
+        for key, expires in list(self._leases.items()):
+            if expires < now:
+                del self._leases[key]
+                self._next_poll.pop(key, None)
+                self._latest.pop(key, None)
+
+    def _poll(self, keys):
+        groups = defaultdict(list)
+        for ticker, interval, period in keys:
+            groups[(interval, period)].append(ticker)
+        for (interval, period), tickers in groups.items():
+            try:
+                # another worker process may have just refreshed the shared store
+                frames = self.store.get_many(tickers, interval, period,
+                                             max_age=self.interval_seconds(interval) / 2)
+            except Exception:
+                logger.exception("Polling %s (%s, %s) failed", tickers, interval, period)
+                frames = {}
+            with self._cond:
+                for ticker in tickers:
+                    key = (ticker, interval, period)
+                    data = frames.get(ticker)
+                    if data is None or data.empty:
+                        # keep serving the last good frame through a failed fetch
+                        data = self._latest.get(key, pd.DataFrame())
+                    self._latest[key] = data
+                self._cond.notify_all()
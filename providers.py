@@ -0,0 +1,133 @@
+import json
+import random
+import time
+from pathlib import Path
+
+import pandas as pd
+
+from bar_store import BarKey, bar_series, split_batch, trim_to_period
+from rate_limit import default_limiter
+
+
+# A provider serves bars in the layout yf.download returns: a (Price, Ticker)
+# column MultiIndex with one column group per symbol, even for a single symbol.
+# Option chains come back as (calls, puts) DataFrames.
+class YahooProvider:
+    def __init__(self, limiter=None):
+        self.limiter = limiter or default_limiter()
+
+    def bars(self, tickers, interval, period=None, start=None, prepost=False, auto_adjust=True):
+        # yfinance pulls in requests/curl_cffi and friends; only pay for it on a fetch
+        import yfinance as yf
+        # yf.download picks its own period when none is passed, so only forward what is set
+        window = {"period": period} if start is None else {"start": start}
+        # a throttled download comes back empty rather than raising, so retry those
+        return self.limiter.call(
+            yf.download, tickers, interval=interval, prepost=prepost, auto_adjust=auto_adjust,
+            progress=False, empty=lambda batch: batch is None or batch.empty, **window,
+        )
+
+    def expirations(self, ticker):
+        import yfinance as yf
+        return tuple(self.limiter.call(lambda: yf.Ticker(ticker).options))
+
+    def option_chain(self, ticker, expiry):
+        import yfinance as yf
+        chain = self.limiter.call(yf.Ticker(ticker).option_chain, expiry)
+        return chain.calls, chain.puts
+
+
+class ReplayProvider:
+    # Serves fixtures recorded with record_fixtures, so the dashboard, the CLI
+    # and the benchmarks run without network access. Each call sleeps for
+    # latency seconds plus up to jitter seconds, drawn from a seeded generator.
+    #
+    #   <root>/bars/<TICKER>/<series>.parquet|json
+    #   <root>/options/<TICKER>/expirations.json
+    #   <root>/options/<TICKER>/<expiry>.calls.parquet|json (and .puts)
+    def __init__(self, root, latency=0.0, jitter=0.0, seed=0):
+        self.root = Path(root)
+        self.latency = latency
+        self.jitter = jitter
+        self._random = random.Random(seed)
+
+    def bars(self, tickers, interval, period=None, start=None, prepost=False, auto_adjust=True):
+        self._wait()
+        tickers = [tickers] if isinstance(tickers, str) else list(tickers)
+        frames = {}
+        for ticker in tickers:
+            series = bar_series(BarKey(ticker, interval, period, prepost, auto_adjust))
+            data = read_fixture(self.root / "bars" / ticker / series)
+            if data is None or data.empty:
+                continue
+            if start is not None:
+                data = data[data.index >= start]
+            elif period is not None:
+                data = trim_to_period(data, period)
+            frames[ticker] = data
+        if not frames:
+            return pd.DataFrame()
+        batch = pd.concat(frames, axis=1, names=["Ticker", "Price"])
+        return batch.swaplevel(axis=1).sort_index(axis=1, level="Price", sort_remaining=False)
+
+    def expirations(self, ticker):
+        self._wait()
+        path = self.root / "options" / ticker / "expirations.json"
+        if not path.exists():
+            return ()
+        return tuple(json.loads(path.read_text()))
+
+    def option_chain(self, ticker, expiry):
+        self._wait()
+        directory = self.root / "options" / ticker
+        calls = read_fixture(directory / f"{expiry}.calls")
+        puts = read_fixture(directory / f"{expiry}.puts")
+        if calls is None or puts is None:
+            raise LookupError(f"No recorded option chain for {ticker} {expiry}")
+        return calls, puts
+
+    def _wait(self):
+        delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+
+def read_fixture(stem):
+    parquet = stem.with_name(stem.name + ".parquet")
+    if parquet.exists():
+        return pd.read_parquet(parquet)
+    path = stem.with_name(stem.name + ".json")
+    if path.exists():
+        return pd.read_json(path, orient="table")
+    return None
+
+
+def write_fixture(stem, data, fmt="parquet"):
+    stem.parent.mkdir(parents=True, exist_ok=True)
+    if fmt == "json":
+        # the table orient keeps the exchange timezone and dtypes; full precision keeps prices exact
+        data.to_json(stem.with_name(stem.name + ".json"), orient="table", double_precision=15)
+    else:
+        data.to_parquet(stem.with_name(stem.name + ".parquet"))
+
+
+def record_fixtures(source, root, tickers, interval, period, expirations=None, fmt="parquet"):
+    # expirations=None records every listed expiry, 0 skips options entirely
+    root = Path(root)
+    batch = source.bars(list(tickers), interval, period=period)
+    for ticker in tickers:
+        data = split_batch(batch, ticker)
+        if data.empty:
+            continue
+        series = bar_series(BarKey(ticker, interval, period))
+        write_fixture(root / "bars" / ticker / series, data.droplevel("Ticker", axis=1), fmt)
+        if expirations == 0:
+            continue
+        listed = source.expirations(ticker)[:expirations]
+        directory = root / "options" / ticker
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / "expirations.json").write_text(json.dumps(list(listed)))
+        for expiry in listed:
+            calls, puts = source.option_chain(ticker, expiry)
+            write_fixture(directory / f"{expiry}.calls", calls, fmt)
+            write_fixture(directory / f"{expiry}.puts", puts, fmt)
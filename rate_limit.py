@@ -0,0 +1,132 @@
+import logging
+import os
+import random
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def is_throttle_message(text):
+    return "RateLimit" in text or "Too Many Requests" in text or " 429" in text
+
+
+def is_throttle_error(error):
+    return is_throttle_message(f"{type(error).__name__}: {error}")
+
+
+class ThrottleLogWatcher(logging.Handler):
+    # yf.download logs per-symbol failures instead of raising them, so throttling
+    # during a download only shows up in the yfinance logger. Counts are kept per
+    # thread: yf.download logs its failure summary from the calling thread, and
+    # one call's throttle must not be charged to calls running next to it.
+    def __init__(self):
+        super().__init__(level=logging.ERROR)
+        self._counts = {}
+        self._counts_lock = threading.Lock()
+
+    def emit(self, record):
+        if is_throttle_message(record.getMessage()):
+            with self._counts_lock:
+                self._counts[record.thread] = self._counts.get(record.thread, 0) + 1
+
+    def count(self):
+        with self._counts_lock:
+            return self._counts.get(threading.get_ident(), 0)
+
+
+class RateLimiter:
+    # Token bucket shared by every upstream call in the process. On throttling
+    # the sustained rate is halved and all callers pause for an exponentially
+    # growing, jittered delay; each success nudges the rate back up.
+    def __init__(self, rate=2.0, burst=5, max_retries=4, base_delay=1.0, max_delay=60.0, min_rate=0.1):
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.min_rate = min_rate
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._waiting = 0
+        self._throttled = 0
+        self._lock = threading.Lock()
+        self._watcher = ThrottleLogWatcher()
+        logging.getLogger("yfinance").addHandler(self._watcher)
+
+    def acquire(self):
+        with self._lock:
+            self._waiting += 1
+        try:
+            while True:
+                with self._lock:
+                    now = time.monotonic()
+                    self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                    self._updated = now
+                    if now >= self._paused_until and self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = max(self._paused_until - now, (1 - self._tokens) / self.rate)
+                time.sleep(wait)
+        finally:
+            with self._lock:
+                self._waiting -= 1
+
+    def call(self, fn, *args, empty=None, **kwargs):
+        for attempt in range(self.max_retries + 1):
+            self.acquire()
+            seen = self._watcher.count()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                if not is_throttle_error(e) or attempt == self.max_retries:
+                    raise
+                self._back_off(attempt, e)
+                continue
+            if self._watcher.count() != seen:
+                self._back_off(attempt, "throttled during download")
+                if (empty is not None and empty(result)) and attempt < self.max_retries:
+                    continue
+            else:
+                self._recover()
+            return result
+
+    def stats(self):
+        with self._lock:
+            return {
+                "queue_depth": self._waiting,
+                "rate": self.rate,
+                "tokens": self._tokens,
+                "paused_for": max(0.0, self._paused_until - time.monotonic()),
+                "throttled": self._throttled,
+            }
+
+    def _back_off(self, attempt, reason):
+        cap = min(self.max_delay, self.base_delay * 2 ** attempt)
+        delay = random.uniform(cap / 2, cap)
+        with self._lock:
+            self._throttled += 1
+            self.rate = max(self.min_rate, self.rate / 2)
+            self._paused_until = max(self._paused_until, time.monotonic() + delay)
+        logger.warning("Upstream throttled (%s); pausing %.1fs, rate now %.2f/s", reason, delay, self.rate)
+
+    def _recover(self):
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate * 1.1)
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def default_limiter():
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = RateLimiter(
+                rate=float(os.environ.get("MACD_UPSTREAM_RATE", "2")),
+                burst=int(os.environ.get("MACD_UPSTREAM_BURST", "5")),
+            )
+        return _default
@@ -0,0 +1,54 @@
+import threading
+
+
+class Call:
+    def __init__(self):
+        self._done = threading.Event()
+        self.result = None
+        self.error = None
+
+    def wait(self, timeout=None):
+        if not self._done.wait(timeout):
+            raise TimeoutError("in-flight fetch did not finish in time")
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+class SingleFlight:
+    # Concurrent misses for the same key share one in-flight call: the first
+    # caller (the leader) runs it, everyone else waits for its result or error.
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        call, leader = self.claim(key)
+        if leader:
+            try:
+                result = fn()
+            except BaseException as e:
+                self.resolve(key, call, error=e)
+                raise
+            self.resolve(key, call, result=result)
+        return call.wait()
+
+    def claim(self, key):
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                return call, False
+            call = self._calls[key] = Call()
+            return call, True
+
+    def resolve(self, key, call, result=None, error=None):
+        call.result = result
+        call.error = error
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+        call._done.set()
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._calls)